@@ -2,7 +2,6 @@ from django.http import HttpRequest, Http404, HttpResponse, HttpResponseRedirect
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from django.shortcuts import get_object_or_404, render
 from django.contrib.auth.models import User
-from directory.forms import NavbarSearchForm
 from directory.models import Sponsor
 from datetime import datetime
 
@@ -15,7 +14,6 @@ def recent_posts(request):
     context = {
         'posts': posts,
         'navbar_context': 'blog',
-        'search_form': NavbarSearchForm(),
         'sponsor': sponsor,
     }
 
@@ -35,7 +33,6 @@ def tag_post_archive(request, tag_slug):
         'navbar_context': 'blog',
         'archive_type': 'by_tag',
         'post_list': post_list,
-        'search_form': NavbarSearchForm(),
         'sponsor': sponsor,
     }
 
@@ -54,7 +51,6 @@ def author_post_archive(request, author_slug):
         'navbar_context': 'blog',
         'archive_type': 'by_author',
         'post_list': post_list,
-        'search_form': NavbarSearchForm(),
         'sponsor': sponsor,
     }
 
@@ -74,7 +70,6 @@ def category_post_archive(request, category_slug):
         'navbar_context': 'blog',
         'archive_type': 'by_category',
         'post_list': post_list,
-        'search_form': NavbarSearchForm(),
         'sponsor': sponsor,
     }
 
@@ -87,7 +82,6 @@ def tag_archive(request):
     context = {
         'navbar_context': 'blog',
         'tag_list': tags,
-        'search_form': NavbarSearchForm(),
         'sponsor': sponsor,
     }
 
@@ -100,7 +94,6 @@ def category_archive(request):
     context = {
         'navbar_context': 'blog',
         'category_list': categories,
-        'search_form': NavbarSearchForm(),
         'sponsor': sponsor,
     }
 
@@ -117,7 +110,6 @@ def author_archive(request):
     context = {
         'navbar_context': 'blog',
         'author_list': usernames,
-        'search_form': NavbarSearchForm(),
         'sponsor': sponsor,
     }
 
@@ -135,7 +127,6 @@ def yearly_post_archive(request, year):
         'navbar_context': 'blog',
         'archive_type': 'by_year',
         'post_list': post_list,
-        'search_form': NavbarSearchForm(),
         'sponsor': sponsor,
     }
 
@@ -154,7 +145,6 @@ def monthly_post_archive(request, year, month):
         'navbar_context': 'blog',
         'archive_type': 'by_month',
         'post_list': post_list,
-        'search_form': NavbarSearchForm(),
         'sponsor': sponsor,
     }
 
@@ -174,7 +164,6 @@ def daily_post_archive(request, year, month, day):
         'navbar_context': 'blog',
         'archive_type': 'by_day',
         'post_list': post_list,
-        'search_form': NavbarSearchForm(),
         'sponsor': sponsor,
     }
 
@@ -191,7 +180,6 @@ def single_post(request, year, month, day, post_slug):
     context = {
         'post': post,
         'navbar_context': 'blog',
-        'search_form': NavbarSearchForm(),
         'sponsor': sponsor,
     }
 
@@ -82,7 +82,9 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
                 # makes list of static pages globally available
-                'directory.context_processors.static_pages'
+                'directory.context_processors.static_pages',
+                # search form rendered in the navbar of every page
+                'directory.context_processors.navbar_search_form',
             ],
         },
     },
@@ -108,6 +110,18 @@ else:
         'default': dj_database_url.config()
     }
 
+# Cache
+# shared by all processes, so invalidation by management commands and
+# other workers reaches every web worker
+# https://docs.djangoproject.com/en/5.0/topics/cache/#database-caching
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'csinfo_cache',
+    }
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/1.11/ref/settings/#auth-password-validators
 
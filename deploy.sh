@@ -1,10 +1,15 @@
 #!/bin/bash
 
 python3 manage.py migrate
+python3 manage.py createcachetable
+# adds the search_vector column to existing databases before it is queried
+python3 manage.py updatesearchvector
 python3 manage.py loaddata directory/fixtures/*
 python3 manage.py scrapeiana
 python3 manage.py filltlsversion
 python3 manage.py updatesecurity
+# refresh search vectors with the technologies loaded from the fixtures
+python3 manage.py updatesearchvector
 python3 manage.py compilescss
 python3 manage.py collectstatic -c --noinput -v 0
 python3 manage.py compress
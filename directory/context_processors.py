@@ -1,8 +1,19 @@
+from directory.forms import NavbarSearchForm
 from directory.models import StaticPage
 
+# unbound forms hold no per-request state, so a single instance is shared
+_NAVBAR_SEARCH_FORM = NavbarSearchForm()
+
+
 def static_pages(request):
     all_static_pages = StaticPage.objects.all()
 
     return {
         'static_pages': all_static_pages,
     }
+
+
+def navbar_search_form(request):
+    return {
+        'search_form': _NAVBAR_SEARCH_FORM,
+    }
@@ -2,10 +2,13 @@ from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from directory.models import CipherSuite, Rfc
 
 
-def paginate(result_list, current_page, elements_per_page):
-    """Generic function for paginating result lists."""
+def paginate(result_list, current_page, elements_per_page, single_page=False):
+    """Generic function for paginating result lists. If single_page is set,
+    all results are put on one page, reusing the paginator's row count."""
 
     paginator = Paginator(result_list, elements_per_page)
+    if single_page and paginator.count > 0:
+        paginator.per_page = paginator.count
     try:
         result = paginator.page(current_page)
     except PageNotAnInteger:
@@ -0,0 +1,97 @@
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import requests
+import re
+
+
+# number of parallel connections to ietf.org
+MAX_CONNECTIONS = 10
+
+# shared session, so consecutive RFC lookups reuse the connection to ietf.org
+_HTTP = requests.Session()
+_HTTP.headers.update({'User-Agent': 'ciphersuite.info'})
+_HTTP.mount('https://', HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=MAX_CONNECTIONS,
+    max_retries=Retry(total=3, backoff_factor=0.3),
+))
+
+# patterns used to extract document information from ietf.org
+_MONTH_YEAR_RE = re.compile(
+    r'\b(?:January|February|March|April|May|June|July|August|September|'
+    r'October|November|December)\b.*?(\d{4})'
+)
+# single alternation, so each text is scanned once for all status options
+_STATUS_RE = re.compile(
+    r'(?P<IST>INTERNET STANDARD)|(?P<PST>PROPOSED STANDARD)|'
+    r'(?P<DST>DRAFT STANDARD)|(?P<BCP>BEST CURRENT PRACTISE)|'
+    r'(?P<INF>INFORMATIONAL)|(?P<EXP>EXPERIMENTAL)|(?P<HST>HISTORIC)',
+    re.IGNORECASE
+)
+_XP_DATE = etree.XPath('//tbody[@class="meta align-top  border-top"]/tr/td[2]/text()')
+_XP_TITLE = etree.XPath('//h1/text()')
+_XP_STATUS = etree.XPath('//td/*[contains(text(),"RFC")]/text()')
+
+
+def get_year(tree):
+    # the date usually is a single text node, so avoid joining all of them
+    nodes = _XP_DATE(tree)
+    for node in nodes:
+        match = _MONTH_YEAR_RE.search(node)
+        if match:
+            return int(match.group(1))
+    match = _MONTH_YEAR_RE.search(" ".join(nodes))
+    return int(match.group(1))
+
+
+def get_title(tree):
+    docinfo = " ".join(_XP_TITLE(tree))
+    return docinfo.strip()
+
+
+def get_status(tree):
+    # get text of table with document properties
+    nodes = _XP_STATUS(tree)
+
+    # search for predefined options
+    for node in nodes:
+        match = _STATUS_RE.search(node)
+        if match:
+            return match.lastgroup
+    return 'UND'
+
+
+def get_tree(response):
+    # feed the page to the parser while it is downloaded; the whole body is
+    # read, so the connection is returned to the session's pool afterwards
+    parser = etree.HTMLParser()
+    for chunk in response.iter_content(chunk_size=32 * 1024):
+        parser.feed(chunk)
+    return parser.close()
+
+
+def rfc_url(number):
+    return f"https://datatracker.ietf.org/doc/rfc{number}"
+
+
+def fetch_rfc(number):
+    """Fetches general document information of an RFC from ietf.org,
+    returning the url, title, status and release_year of the document."""
+
+    url = rfc_url(number)
+    with _HTTP.get(url, stream=True, timeout=(3.05, 10)) as rfc:
+        if rfc.status_code == 200:
+            # parse the page once and share the tree between all extractors
+            tree = get_tree(rfc)
+        else:
+            # consume the body, so the connection can be reused
+            rfc.content
+            raise Exception('RFC not found')
+
+    return {
+        'url': url,
+        'title': get_title(tree),
+        'status': get_status(tree),
+        'release_year': get_year(tree),
+    }
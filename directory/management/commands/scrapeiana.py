@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.core.management.base import BaseCommand, CommandError
 from directory.models import CipherSuite, Rfc
 from os import linesep
@@ -51,6 +52,17 @@ class Command(BaseCommand):
 
         return result
 
+    def split_rfc(self, rfc):
+        """Returns the number and draft status of an RFC reference."""
+
+        regular_rfc = re.match(r'RFC(\d+)', rfc)
+        draft_rfc   = re.match(r'RFC-ietf-tls-rfc(\d+).+', rfc)
+
+        if regular_rfc is not None:
+            return (int(regular_rfc.group(1)), False)
+        elif draft_rfc is not None:
+            return (int(draft_rfc.group(1)), True)
+
     def handle(self, *args, **options):
         """Main function to be run when command is executed."""
 
@@ -63,6 +75,7 @@ class Command(BaseCommand):
 
         # counter for successfully inserted or found ciphers
         cs_new = cs_old = rfc_new = 0
+        cipher_suites = []
         for line in csv_file.split(linesep):
             # try splitting line its separate components or skip it
             try:
@@ -90,6 +103,37 @@ class Command(BaseCommand):
                     )
                 continue
 
+            d['rfcs'] = [self.split_rfc(rfc) for rfc in d['rfcs']]
+            cipher_suites.append(d)
+
+        # fetch all referenced RFCs at once, instead of one by one on save
+        for draft_status in (False, True):
+            rfc_numbers = {
+                rfc_nr for d in cipher_suites for (rfc_nr, is_draft) in d['rfcs']
+                if is_draft == draft_status
+            }
+            created, failed = Rfc.custom_filters.bulk_import(
+                rfc_numbers, draft_status)
+            for rfc_nr, error in failed.items():
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"Failed to fetch RFC '{rfc_nr}': {error}. Skipping."
+                    )
+                )
+            for r in created:
+                rfc_new += 1
+                if verbosity > 2:
+                    self.stdout.write(
+                        self.style.SUCCESS(
+                            f"Successfully created RFC '{r.number}'."
+                        )
+                    )
+
+        rfcs = Rfc.objects.in_bulk(
+            {rfc_nr for d in cipher_suites for (rfc_nr, _) in d['rfcs']}
+        )
+
+        for d in cipher_suites:
             # create model instances in DB
             c, cstat = CipherSuite.objects.get_or_create(
                 name = d['name'],
@@ -97,31 +141,10 @@ class Command(BaseCommand):
                 hex_byte_2 = d['hex2'],
             )
 
-            for rfc in d['rfcs']:
-                regular_rfc = re.match(r'RFC(\d+)', rfc)
-                draft_rfc   = re.match(r'RFC-ietf-tls-rfc(\d+).+', rfc)
-
-                if regular_rfc is not None:
-                    rfc_nr = regular_rfc.group(1)
-                    draft_status = False
-                elif draft_rfc is not None:
-                    rfc_nr = draft_rfc.group(1)
-                    draft_status = True
-
-                r, rstat = Rfc.objects.get_or_create(
-                    number = rfc_nr,
-                    is_draft = draft_status
-                )
-                c.defining_rfcs.add(r)
-
-                if rstat:
-                    rfc_new += 1
-                    if verbosity > 2:
-                        self.stdout.write(
-                            self.style.SUCCESS(
-                                f"Successfully created RFC '{r.number}'."
-                            )
-                        )
+            for (rfc_nr, _) in d['rfcs']:
+                # RFCs that failed to fetch are not stored
+                if rfc_nr in rfcs:
+                    c.defining_rfcs.add(rfcs[rfc_nr])
 
             if cstat:
                 cs_new += 1
@@ -134,6 +157,9 @@ class Command(BaseCommand):
             else:
                 cs_old += 1
 
+        # bulk_create() doesn't send post_save, so invalidate cached pages here
+        cache.clear()
+
         self.stdout.write(
             self.style.SUCCESS(
                 f"Successfully created {cs_new} ({cs_old}) cipher suites and {rfc_new} RFCs."
@@ -0,0 +1,46 @@
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from directory.models import CipherSuite
+
+
+class Command(BaseCommand):
+    help = 'Updates search vectors of stored cipher suites'
+
+    def add_search_vector_column(self):
+        """Adds the search_vector column to existing databases, since the
+        directory app ships no migrations. Returns True if it was added."""
+
+        table = CipherSuite._meta.db_table
+        with connection.cursor() as cursor:
+            columns = [
+                c.name for c in
+                connection.introspection.get_table_description(cursor, table)
+            ]
+
+        if 'search_vector' in columns:
+            return False
+
+        with connection.schema_editor() as editor:
+            editor.add_field(
+                CipherSuite,
+                CipherSuite._meta.get_field('search_vector')
+            )
+        return True
+
+    def handle(self, *args, **options):
+        """Main function to be run when command is executed."""
+
+        if self.add_search_vector_column():
+            self.stdout.write("Added search_vector column to cipher suites.")
+
+        updates = CipherSuite.custom_filters.update_search_vectors()
+
+        # update() doesn't send post_save, so invalidate cached pages here
+        cache.clear()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully updated {updates} cipher suite search vectors."
+            )
+        )
@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.core.management.base import BaseCommand, CommandError
 from directory.models import CipherSuite
 
@@ -22,6 +23,9 @@ class Command(BaseCommand):
 
         updates = recommended + secure + insecure + weak
 
+        # update() doesn't send post_save, so invalidate cached pages here
+        cache.clear()
+
         self.stdout.write(
             self.style.SUCCESS(
                 f"Successfully updated {updates} cipher suite ratings:\n" +
@@ -1,10 +1,12 @@
 from django.utils.translation import gettext_lazy as _
-from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, SearchVectorField
 from django.db.models.fields.related import ManyToManyField
 from django.db import models
-from django.db.models import Q
+from django.db.models import F, Q, Value
 from markdownx.models import MarkdownxField
 from markdownx.utils import markdownify
+from concurrent.futures import ThreadPoolExecutor
+from directory.ietf import MAX_CONNECTIONS, fetch_rfc
 
 
 class PrintableModel(models.Model):
@@ -12,7 +14,10 @@ class PrintableModel(models.Model):
         opts = self._meta
         data = {}
         for f in opts.concrete_fields + opts.many_to_many:
-            if isinstance(f, ManyToManyField):
+            if isinstance(f, SearchVectorField):
+                # internal search index, not part of the public data
+                continue
+            elif isinstance(f, ManyToManyField):
                 if self.pk is None:
                     data[f.name] = []
                 else:
@@ -72,26 +77,23 @@ class CipherSuiteQuerySet(models.QuerySet):
             Q(hash_algorithm__vulnerabilities__severity=2)
         ).distinct()
 
+    def update_search_vectors(self):
+        """Updates the stored search vector of all cipher suites in this QuerySet."""
+
+        updates = 0
+        for cs in self:
+            updates += cs.update_search_vector()
+        return updates
+
     def search(self, search_term):
         # create query and vector object needed for ranking results
         query = SearchQuery(search_term.strip())
-        vector = SearchVector('name', weight='A') + \
-            SearchVector('openssl_name', weight='A') +\
-            SearchVector('gnutls_name', weight='A') + \
-            SearchVector('auth_algorithm__long_name', weight='B') + \
-            SearchVector('enc_algorithm__long_name', weight='B') + \
-            SearchVector('kex_algorithm__long_name', weight='B') + \
-            SearchVector('hash_algorithm__long_name', weight='B') + \
-            SearchVector('protocol_version__vulnerabilities__name', weight='C') + \
-            SearchVector('auth_algorithm__vulnerabilities__name', weight='C') + \
-            SearchVector('enc_algorithm__vulnerabilities__name', weight='C') + \
-            SearchVector('kex_algorithm__vulnerabilities__name', weight='C') + \
-            SearchVector('hash_algorithm__vulnerabilities__name', weight='C')
-
-        # retrieve list of all results ordered by decreasing relevancy
+
+        # retrieve list of all results ordered by decreasing relevancy,
+        # using the search vector stored with each cipher suite
         ranked_results = CipherSuite.objects.annotate(
-            rank=SearchRank(vector, query)
-        ).order_by('-rank')
+            rank=SearchRank(F('search_vector'), query)
+        ).order_by(F('rank').desc(nulls_last=True))
 
         # exclude items that do not match query at all
         return ranked_results.exclude(
@@ -119,6 +121,40 @@ class RfcQuerySet(models.QuerySet):
             Q(number__icontains=search_term)
         ).distinct()
 
+    def bulk_import(self, numbers, is_draft=False):
+        """Creates Rfc instances for all given numbers that are not stored
+        yet, fetching their document information from ietf.org in parallel.
+        Since bulk_create() doesn't send the pre_save signal, this is the
+        preferred way of importing many RFCs at once. Returns the created
+        instances and a dict of numbers that failed to fetch with their error."""
+
+        numbers = {int(n) for n in numbers}
+        existing = set(
+            self.filter(number__in=numbers).values_list('number', flat=True)
+        )
+        missing = sorted(numbers - existing)
+
+        rfcs = []
+        failed = {}
+        with ThreadPoolExecutor(max_workers=MAX_CONNECTIONS) as executor:
+            for number, document, error in executor.map(_try_fetch_rfc, missing):
+                if error is None:
+                    rfcs.append(
+                        self.model(number=number, is_draft=is_draft, **document)
+                    )
+                else:
+                    # skip unavailable documents instead of losing all others
+                    failed[number] = error
+
+        return self.bulk_create(rfcs, ignore_conflicts=True), failed
+
+
+def _try_fetch_rfc(number):
+    try:
+        return (number, fetch_rfc(number), None)
+    except Exception as error:
+        return (number, None, error)
+
 
 class CipherImplementation(models.Model):
     class Meta:
@@ -250,6 +286,11 @@ class CipherSuite(PrintableModel):
         blank=True,
         editable=True,
     )
+    # precomputed full text search vector, see update_search_vector()
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+    )
 
     @property
     def recommended(self):
@@ -301,6 +342,34 @@ class CipherSuite(PrintableModel):
         if v in self.tls_version.all():
             return True
 
+    def update_search_vector(self):
+        """Stores the weighted search vector of names, algorithms
+        and vulnerabilities used for ranking search results."""
+
+        # read from the database, related instances may be cached and stale
+        long_names = CipherSuite.objects.filter(pk=self.pk).values_list(
+            'auth_algorithm__long_name',
+            'enc_algorithm__long_name',
+            'kex_algorithm__long_name',
+            'hash_algorithm__long_name',
+        ).first() or ()
+        vulnerabilities = Vulnerability.objects.filter(
+            Q(protocolversion=self.protocol_version_id)|
+            Q(authalgorithm=self.auth_algorithm_id)|
+            Q(encalgorithm=self.enc_algorithm_id)|
+            Q(kexalgorithm=self.kex_algorithm_id)|
+            Q(hashalgorithm=self.hash_algorithm_id)
+        ).distinct().values_list('name', flat=True)
+
+        names = [self.name, self.openssl_name, self.gnutls_name]
+
+        return CipherSuite.objects.filter(pk=self.pk).update(
+            search_vector=\
+                SearchVector(Value(" ".join(names)), weight='A') + \
+                SearchVector(Value(" ".join(long_names)), weight='B') + \
+                SearchVector(Value(" ".join(vulnerabilities)), weight='C')
+        )
+
     objects = models.Manager()
     custom_filters = CipherSuiteQuerySet.as_manager()
 
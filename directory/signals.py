@@ -1,68 +1,69 @@
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
-from django.db.models.signals import pre_save
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save, pre_delete, pre_save
 from django.dispatch import receiver
 from directory.models import *
-from lxml import html
-import requests
+from directory.ietf import rfc_url
+from directory.tasks import enqueue_rfc_metadata
+from functools import partial
 import re
 
 
-@receiver(pre_save, sender=Rfc)
-def complete_rfc_instance(sender, instance, *args, **kwargs):
-    """Automatically fetches general document information
-    from ietf.org before saving RFC instance."""
-
-    def get_year(html):
-        docinfo = " ".join(
-            html.xpath('//tbody[@class="meta align-top  border-top"]/tr/td[2]/text()')
-        ).strip()
-        month_list = ['January', 'February', 'March', 'April', 'May', 'June',
-            'July', 'August', 'September', 'October', 'November', 'December']
-        month_and_year = re.compile(
-            r'\b(?:%s)\b.*?(\d{4})' % '|'.join(month_list)
+# process-local cache of technology instances, keyed by model and short_name
+_TECH_CACHE = {
+    ProtocolVersion: {},
+    KexAlgorithm: {},
+    AuthAlgorithm: {},
+    EncAlgorithm: {},
+    HashAlgorithm: {},
+}
+
+
+def get_technology(model, short_name, **defaults):
+    """Returns the technology instance with the given short_name, creating
+    or updating it if necessary. Instances are cached once committed, so
+    repeated cipher suite saves don't query the same rows over and over."""
+
+    tech_cache = _TECH_CACHE[model]
+    tech = tech_cache.get(short_name)
+    if tech is not None and \
+        all(getattr(tech, k) == v for k, v in defaults.items()):
+        return tech
+
+    if defaults:
+        tech, _ = model.objects.update_or_create(
+            short_name=short_name,
+            defaults=defaults
         )
-        match = month_and_year.search(docinfo)
-        return int(match.group(1))
-
-    def get_title(html):
-        docinfo = " ".join(html.xpath('//h1/text()'))
-        return docinfo.strip()
-
-    def get_status(html):
-        # get table with document properties
-        docinfo = " ".join(
-            html.xpath('//td/*[contains(text(),"RFC")]/text()')
-        ).strip()
-
-        # search for predefined options
-        if re.search('INTERNET STANDARD', docinfo, re.IGNORECASE):
-            return 'IST'
-        elif re.search('PROPOSED STANDARD', docinfo, re.IGNORECASE):
-            return 'PST'
-        elif re.search('DRAFT STANDARD', docinfo, re.IGNORECASE):
-            return 'DST'
-        elif re.search('BEST CURRENT PRACTISE', docinfo, re.IGNORECASE):
-            return 'BCP'
-        elif re.search('INFORMATIONAL', docinfo, re.IGNORECASE):
-            return 'INF'
-        elif re.search('EXPERIMENTAL', docinfo, re.IGNORECASE):
-            return 'EXP'
-        elif re.search('HISTORIC', docinfo, re.IGNORECASE):
-            return 'HST'
-        else:
-            return 'UND'
-
-    url = f"https://datatracker.ietf.org/doc/rfc{instance.number}"
-    rfc = requests.get(url)
-    if rfc.status_code == 200:
-        content = html.fromstring(rfc.content)
-        instance.url  = url
-        instance.title = get_title(content)
-        instance.status = get_status(content)
-        instance.release_year = get_year(content)
     else:
-        # cancel saving the instance if unable to receive web page
-        raise Exception('RFC not found')
+        tech, _ = model.objects.get_or_create(short_name=short_name)
+
+    # only cache rows that survive the current transaction
+    transaction.on_commit(partial(tech_cache.__setitem__, short_name, tech))
+    return tech
+
+
+@receiver(pre_save, sender=Rfc)
+def complete_rfc_instance(sender, instance, *args, **kwargs):
+    """Sets placeholders for the document information of new RFC instances,
+    which is fetched from ietf.org in the background once saved."""
+
+    instance.url = rfc_url(instance.number)
+    if not instance.status:
+        instance.status = Rfc.UND
+    if instance.release_year is None:
+        instance.release_year = 0
+
+
+@receiver(post_save, sender=Rfc)
+def fetch_rfc_instance(sender, instance, created, raw=False, *args, **kwargs):
+    # also fetch again if an earlier background fetch has failed
+    placeholder = not instance.title and instance.release_year == 0
+    if (created or placeholder) and not raw:
+        number = instance.number
+        transaction.on_commit(lambda: enqueue_rfc_metadata(number))
 
 
 @receiver(pre_save, sender=CipherSuite)
@@ -127,18 +128,28 @@ def complete_cs_instance(sender, instance, *args, **kwargs):
             name = instance.name
             export_cipher = False
 
-        (prt,_,rst) = name.replace("_", " ").partition(" ")
-        (kex,_,rst) = rst.partition("WITH")
+        parts = name.split("_")
+        if "WITH" in parts[1:-1]:
+            # <prt>_<kex>[_<aut>]_WITH_<enc>_<hsh>
+            with_idx = parts.index("WITH")
+            prt = parts[0]
+            kex = parts[1] if with_idx > 1 else ""
+            aut = " ".join(parts[2:with_idx])
+            enc = " ".join(parts[with_idx+1:-1])
+            hsh = parts[-1]
+        else:
+            (prt,_,rst) = name.replace("_", " ").partition(" ")
+            (kex,_,rst) = rst.partition("WITH")
+
+            # split kex again, potentially yielding auth algorithm
+            # otherwise this variable will remain unchanged
+            (kex,_,aut) = kex.partition(" ")
+            (enc,_,hsh) = rst.rpartition(" ")
 
         # add information about export-grade cipher to protocol version
         if export_cipher:
             prt += " EXPORT"
 
-        # split kex again, potentially yielding auth algorithm
-        # otherwise this variable will remain unchanged
-        (kex,_,aut) = kex.partition(" ")
-        (enc,_,hsh) = rst.rpartition(" ")
-
         # split enc again if we only got a number for hsh
         # specifically needed for CCM/CCM8 ciphers
         if re.match(r'\d+', hsh.strip()) or re.match(r'CCM\Z', hsh.strip()):
@@ -159,28 +170,123 @@ def complete_cs_instance(sender, instance, *args, **kwargs):
 
     # connect foreign keys from other models
     # if aut is not excplicitly defined, set it equal to kex
-    if not aut:
-        instance.auth_algorithm, _ = AuthAlgorithm.objects.get_or_create(
-            short_name=kex.strip()
-        )
-    else:
-        instance.auth_algorithm, _ = AuthAlgorithm.objects.get_or_create(
-            short_name=aut.strip()
-        )
-    instance.kex_algorithm, _ = KexAlgorithm.objects.update_or_create(
-        short_name=kex.strip(),
-        defaults={'pfs_support': flag_pfs}
+    instance.auth_algorithm = get_technology(
+        AuthAlgorithm, (aut or kex).strip()
     )
-    instance.protocol_version, _ = ProtocolVersion.objects.get_or_create(
-        short_name=prt.strip()
+    instance.kex_algorithm = get_technology(
+        KexAlgorithm, kex.strip(), pfs_support=flag_pfs
     )
-    instance.hash_algorithm, _ = HashAlgorithm.objects.get_or_create(
-        short_name=hsh.strip()
+    instance.protocol_version = get_technology(
+        ProtocolVersion, prt.strip()
     )
-    instance.enc_algorithm, _ = EncAlgorithm.objects.update_or_create(
-        short_name=enc.strip(),
-        defaults={'aead_algorithm': flag_aead}
+    instance.hash_algorithm = get_technology(
+        HashAlgorithm, hsh.strip()
     )
+    instance.enc_algorithm = get_technology(
+        EncAlgorithm, enc.strip(), aead_algorithm=flag_aead
+    )
+
+
+@receiver(post_save, sender=CipherSuite)
+def complete_cs_search_vector(sender, instance, raw=False, *args, **kwargs):
+    # fixtures are loaded without their related instances being complete
+    if not raw:
+        instance.update_search_vector()
+
+
+# foreign keys of CipherSuite referring to each technology model
+_TECH_FIELDS = {
+    ProtocolVersion: 'protocol_version',
+    KexAlgorithm: 'kex_algorithm',
+    AuthAlgorithm: 'auth_algorithm',
+    EncAlgorithm: 'enc_algorithm',
+    HashAlgorithm: 'hash_algorithm',
+}
+
+
+@receiver(post_save, sender=ProtocolVersion)
+@receiver(post_save, sender=KexAlgorithm)
+@receiver(post_save, sender=AuthAlgorithm)
+@receiver(post_save, sender=EncAlgorithm)
+@receiver(post_save, sender=HashAlgorithm)
+def update_technology_search_vectors(sender, instance, created, raw=False, update_fields=None, *args, **kwargs):
+    # long names are part of the search vectors of related cipher suites,
+    # flag updates by get_technology() don't affect them
+    if update_fields is not None and 'long_name' not in update_fields:
+        return
+    if not created and not raw:
+        CipherSuite.custom_filters.filter(
+            **{_TECH_FIELDS[sender]: instance}
+        ).update_search_vectors()
+
+
+@receiver(m2m_changed, sender=ProtocolVersion.vulnerabilities.through)
+@receiver(m2m_changed, sender=KexAlgorithm.vulnerabilities.through)
+@receiver(m2m_changed, sender=AuthAlgorithm.vulnerabilities.through)
+@receiver(m2m_changed, sender=EncAlgorithm.vulnerabilities.through)
+@receiver(m2m_changed, sender=HashAlgorithm.vulnerabilities.through)
+def update_vulnerability_search_vectors(sender, instance, action, reverse, model, pk_set, *args, **kwargs):
+    # vulnerability names are part of the search vectors of related cipher suites
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        # instance is a technology, whose vulnerabilities changed
+        field = _TECH_FIELDS[type(instance)]
+        cipher_suites = CipherSuite.custom_filters.filter(**{field: instance})
+    elif pk_set is not None:
+        # instance is a vulnerability, model the changed technology
+        field = _TECH_FIELDS[model]
+        cipher_suites = CipherSuite.custom_filters.filter(**{f"{field}__in": pk_set})
+    else:
+        # vulnerability cleared from all technologies, which aren't known anymore
+        cipher_suites = CipherSuite.custom_filters.all()
+
+    cipher_suites.update_search_vectors()
+
+
+@receiver(pre_delete, sender=Vulnerability)
+def collect_deleted_vulnerability_cipher_suites(sender, instance, *args, **kwargs):
+    # relations to technologies are gone after deletion, so remember them here
+    instance._affected_cipher_suites = list(
+        CipherSuite.objects.filter(
+            Q(protocol_version__vulnerabilities=instance)|
+            Q(kex_algorithm__vulnerabilities=instance)|
+            Q(auth_algorithm__vulnerabilities=instance)|
+            Q(enc_algorithm__vulnerabilities=instance)|
+            Q(hash_algorithm__vulnerabilities=instance)
+        ).distinct().values_list('pk', flat=True)
+    )
+
+
+@receiver(post_delete, sender=Vulnerability)
+def update_deleted_vulnerability_search_vectors(sender, instance, *args, **kwargs):
+    CipherSuite.custom_filters.filter(
+        pk__in=getattr(instance, '_affected_cipher_suites', [])
+    ).update_search_vectors()
+
+
+@receiver(post_save, sender=ProtocolVersion)
+@receiver(post_save, sender=KexAlgorithm)
+@receiver(post_save, sender=AuthAlgorithm)
+@receiver(post_save, sender=EncAlgorithm)
+@receiver(post_save, sender=HashAlgorithm)
+@receiver(post_delete, sender=ProtocolVersion)
+@receiver(post_delete, sender=KexAlgorithm)
+@receiver(post_delete, sender=AuthAlgorithm)
+@receiver(post_delete, sender=EncAlgorithm)
+@receiver(post_delete, sender=HashAlgorithm)
+def invalidate_technology(sender, instance, *args, **kwargs):
+    _TECH_CACHE[sender].pop(instance.pk, None)
+    # cipher suite details show the names of their algorithms
+    cache.clear()
+
+
+@receiver(post_migrate)
+def clear_technology_cache(sender, *args, **kwargs):
+    # also emitted by the flush command, which empties all tables
+    for tech_cache in _TECH_CACHE.values():
+        tech_cache.clear()
 
 
 @receiver(pre_save, sender=CipherSuite)
@@ -209,3 +315,31 @@ def complete_tls_version(sender, instance, *args, **kwargs):
 def complete_cs_names(sender, instance, *args, **kwargs):
     if instance.show_in_nav == False:
         instance.direct_link = False
+
+
+@receiver(post_save, sender=CipherSuite)
+@receiver(post_save, sender=Rfc)
+@receiver(post_save, sender=StaticPage)
+@receiver(post_save, sender=Announcement)
+@receiver(post_save, sender=Sponsor)
+@receiver(post_delete, sender=CipherSuite)
+@receiver(post_delete, sender=Rfc)
+@receiver(post_delete, sender=StaticPage)
+@receiver(post_delete, sender=Announcement)
+@receiver(post_delete, sender=Sponsor)
+@receiver(m2m_changed, sender=CipherSuite.tls_version.through)
+@receiver(m2m_changed, sender=Rfc.defined_cipher_suites.through)
+@receiver(m2m_changed, sender=Rfc.related_documents.through)
+@receiver(post_save, sender=Vulnerability)
+@receiver(post_delete, sender=Vulnerability)
+@receiver(m2m_changed, sender=ProtocolVersion.vulnerabilities.through)
+@receiver(m2m_changed, sender=KexAlgorithm.vulnerabilities.through)
+@receiver(m2m_changed, sender=AuthAlgorithm.vulnerabilities.through)
+@receiver(m2m_changed, sender=EncAlgorithm.vulnerabilities.through)
+@receiver(m2m_changed, sender=HashAlgorithm.vulnerabilities.through)
+def invalidate_page_cache(sender, action=None, *args, **kwargs):
+    # only m2m_changed sends an action, its pre_* signals change nothing yet
+    if action is not None and action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    # cached pages and cipher suite details may show any of these instances
+    cache.clear()
@@ -0,0 +1,52 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.core.cache import cache
+from django.db import connections
+from directory.ietf import MAX_CONNECTIONS, fetch_rfc
+from directory.models import Rfc
+import logging
+import time
+
+
+logger = logging.getLogger(__name__)
+
+# background workers, keeping network requests out of the request/write path
+_EXECUTOR = ThreadPoolExecutor(max_workers=MAX_CONNECTIONS)
+
+# retries of failed fetches, waiting RETRY_BACKOFF * 2^n seconds in between
+RETRIES = 3
+RETRY_BACKOFF = 1.0
+
+
+def populate_rfc_metadata(number, retries=RETRIES):
+    """Fetches general document information of a stored RFC
+    from ietf.org and updates the corresponding instance.
+    Failed fetches are retried with exponential backoff."""
+
+    for attempt in range(retries + 1):
+        try:
+            document = fetch_rfc(number)
+            break
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+    Rfc.objects.filter(pk=number).update(**document)
+    # update() doesn't send post_save, so invalidate cached pages here
+    cache.clear()
+
+
+def _run_populate_rfc_metadata(number):
+    try:
+        populate_rfc_metadata(number)
+    except Exception:
+        logger.exception(f"Failed to fetch document information of RFC {number}.")
+    finally:
+        # worker threads open their own database connections
+        connections.close_all()
+
+
+def enqueue_rfc_metadata(number):
+    """Schedules populate_rfc_metadata() to run in the background."""
+
+    return _EXECUTOR.submit(_run_populate_rfc_metadata, number)
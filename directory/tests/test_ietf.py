@@ -0,0 +1,59 @@
+from django.test import SimpleTestCase
+from directory import ietf
+from pathlib import Path
+from unittest import mock
+
+
+class FakeResponse:
+    """Minimal streamed response, serving a file in small chunks."""
+
+    def __init__(self, content, status_code=200):
+        self.content = content
+        self.status_code = status_code
+        self.consumed = False
+
+    def iter_content(self, chunk_size=1):
+        # small chunks, so elements are split across several feeds
+        for i in range(0, len(self.content), 64):
+            yield self.content[i:i+64]
+        self.consumed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+class DatatrackerParserUnitTests(SimpleTestCase):
+    page = (Path(__file__).parent / 'data' / 'rfc5246.html').read_bytes()
+
+    def test_extractors(self):
+        tree = ietf.get_tree(FakeResponse(self.page))
+        self.assertEqual(
+            ietf.get_title(tree),
+            'The Transport Layer Security (TLS) Protocol Version 1.2'
+        )
+        self.assertEqual(ietf.get_status(tree), 'PST')
+        self.assertEqual(ietf.get_year(tree), 2008)
+
+    def test_body_consumed(self):
+        # reading the whole body returns the connection to the pool
+        response = FakeResponse(self.page)
+        ietf.get_tree(response)
+        self.assertTrue(response.consumed)
+
+    def test_fetch_rfc(self):
+        with mock.patch.object(ietf._HTTP, 'get', return_value=FakeResponse(self.page)):
+            document = ietf.fetch_rfc(5246)
+        self.assertEqual(document, {
+            'url': 'https://datatracker.ietf.org/doc/rfc5246',
+            'title': 'The Transport Layer Security (TLS) Protocol Version 1.2',
+            'status': 'PST',
+            'release_year': 2008,
+        })
+
+    def test_fetch_rfc_not_found(self):
+        with mock.patch.object(ietf._HTTP, 'get', return_value=FakeResponse(b'', 404)):
+            with self.assertRaises(Exception):
+                ietf.fetch_rfc(5246)
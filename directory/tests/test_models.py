@@ -1,5 +1,7 @@
 from django.test import TestCase
+from unittest import mock
 from directory.models import *
+from directory.tasks import populate_rfc_metadata
 
 class CipherSuiteRegularUnitTests(TestCase):
     cipher_suite = 'TLS_DH_DSS_WITH_AES_256_CBC_SHA'
@@ -105,6 +107,9 @@ class RfcUnitTests(TestCase):
 
     def setUp(self):
         Rfc.objects.create(number=self.rfc_number)
+        # document information is usually fetched in the background
+        # without retries, so a failing network doesn't stall the suite
+        populate_rfc_metadata(self.rfc_number, retries=0)
 
     def test_string_representation(self):
         rfc = Rfc.objects.get(number=self.rfc_number)
@@ -115,4 +120,136 @@ class RfcUnitTests(TestCase):
         self.assertEqual(rfc.title.__str__(), self.rfc_title)
         self.assertEqual(rfc.status.__str__(), self.rfc_status)
         self.assertEqual(rfc.is_draft.__str__(), f"{self.rfc_draft}")
-        self.assertEqual(rfc.release_year.__str__(), f"{self.rfc_year}")
\ No newline at end of file
+        self.assertEqual(rfc.release_year.__str__(), f"{self.rfc_year}")
+
+class CipherSuiteSearchUnitTests(TestCase):
+    dhe_suite = 'TLS_DHE_RSA_WITH_AES_256_CBC_SHA'
+    rsa_suite = 'TLS_RSA_WITH_AES_256_CBC_SHA'
+
+    def setUp(self):
+        CipherSuite.objects.create(
+            name=self.dhe_suite, hex_byte_1='0x00', hex_byte_2='0x39')
+        CipherSuite.objects.create(
+            name=self.rsa_suite, hex_byte_1='0x00', hex_byte_2='0x35')
+
+    def matches(self, term):
+        return CipherSuite.objects.filter(search_vector=SearchQuery(term))\
+            .values_list('name', flat=True)
+
+    def test_search_vector_stored(self):
+        self.assertIn(self.dhe_suite, self.matches('DHE'))
+        self.assertNotIn(self.rsa_suite, self.matches('DHE'))
+
+    def test_search_vector_long_name_update(self):
+        kex = KexAlgorithm.objects.get(short_name='DHE')
+        kex.long_name = 'Ephemeral Diffie-Hellman'
+        kex.save()
+        self.assertIn(self.dhe_suite, self.matches('Ephemeral'))
+
+    def test_search_vector_vulnerability_update(self):
+        vuln = Vulnerability.objects.create(name='Logjam')
+        KexAlgorithm.objects.get(short_name='DHE').vulnerabilities.add(vuln)
+        self.assertIn(self.dhe_suite, self.matches('Logjam'))
+
+        vuln.kexalgorithm_set.clear()
+        self.assertNotIn(self.dhe_suite, self.matches('Logjam'))
+
+    def test_search_ranking(self):
+        # DHE appears in the name of one and in a vulnerability of the other
+        vuln = Vulnerability.objects.create(name='DHE-weakness')
+        KexAlgorithm.objects.get(short_name='RSA').vulnerabilities.add(vuln)
+        results = [cs.name for cs in CipherSuite.custom_filters.search('DHE')]
+        self.assertEqual(results, [self.dhe_suite, self.rsa_suite])
+
+    def test_search_ranking_without_vector(self):
+        # suites without a stored vector are listed last
+        CipherSuite.objects.filter(name=self.dhe_suite).update(search_vector=None)
+        results = [cs.name for cs in CipherSuite.custom_filters.search('AES')]
+        self.assertEqual(results, [self.rsa_suite, self.dhe_suite])
+
+
+class RfcBulkImportUnitTests(TestCase):
+    def fake_fetch_rfc(self, number):
+        if number == 9999:
+            raise Exception('RFC not found')
+        return {
+            'url': f"https://datatracker.ietf.org/doc/rfc{number}",
+            'title': f"Title of RFC {number}",
+            'status': 'PST',
+            'release_year': 2008,
+        }
+
+    def test_bulk_import(self):
+        Rfc.objects.bulk_create([
+            Rfc(number=5246, title='Existing', status='PST', release_year=2008)
+        ])
+
+        with mock.patch('directory.models.fetch_rfc', side_effect=self.fake_fetch_rfc) as fetch, \
+            mock.patch('directory.signals.enqueue_rfc_metadata') as enqueue, \
+            self.captureOnCommitCallbacks(execute=True):
+            created, failed = Rfc.custom_filters.bulk_import([5246, 8446, 9999])
+
+        # stored RFCs are not fetched again, failures don't prevent others
+        self.assertEqual(sorted(c.args[0] for c in fetch.call_args_list), [8446, 9999])
+        self.assertEqual([r.number for r in created], [8446])
+        self.assertEqual(list(failed), [9999])
+        self.assertFalse(Rfc.objects.filter(number=9999).exists())
+
+        # bulk_create() bypasses the signals fetching document information
+        enqueue.assert_not_called()
+        rfc = Rfc.objects.get(number=8446)
+        self.assertEqual(rfc.title, 'Title of RFC 8446')
+        self.assertEqual(rfc.release_year, 2008)
+
+
+class RfcBackgroundFetchUnitTests(TestCase):
+    rfc_number = 8446
+    document = {
+        'url': 'https://datatracker.ietf.org/doc/rfc8446',
+        'title': 'The Transport Layer Security (TLS) Protocol Version 1.3',
+        'status': 'PST',
+        'release_year': 2018,
+    }
+
+    def test_create_enqueues_fetch(self):
+        with mock.patch('directory.signals.enqueue_rfc_metadata') as enqueue:
+            with self.captureOnCommitCallbacks(execute=True):
+                rfc = Rfc.objects.create(number=self.rfc_number)
+            enqueue.assert_called_once_with(self.rfc_number)
+            self.assertEqual(rfc.status, 'UND')
+
+            # saving again while the placeholder is kept retries the fetch
+            with self.captureOnCommitCallbacks(execute=True):
+                rfc.save()
+            self.assertEqual(enqueue.call_count, 2)
+
+            # once fetched, saving doesn't fetch again
+            Rfc.objects.filter(pk=self.rfc_number).update(**self.document)
+            with self.captureOnCommitCallbacks(execute=True):
+                Rfc.objects.get(pk=self.rfc_number).save()
+            self.assertEqual(enqueue.call_count, 2)
+
+    def test_populate_retries(self):
+        Rfc.objects.bulk_create([
+            Rfc(number=self.rfc_number, status='UND', release_year=0)
+        ])
+
+        with mock.patch('directory.tasks.fetch_rfc',
+                        side_effect=[Exception('timeout'), self.document]) as fetch, \
+            mock.patch('directory.tasks.time.sleep') as sleep:
+            populate_rfc_metadata(self.rfc_number)
+
+        self.assertEqual(fetch.call_count, 2)
+        sleep.assert_called_once()
+        rfc = Rfc.objects.get(pk=self.rfc_number)
+        self.assertEqual(rfc.title, self.document['title'])
+        self.assertEqual(rfc.release_year, 2018)
+
+    def test_populate_gives_up(self):
+        with mock.patch('directory.tasks.fetch_rfc',
+                        side_effect=Exception('RFC not found')) as fetch, \
+            mock.patch('directory.tasks.time.sleep'):
+            with self.assertRaises(Exception):
+                populate_rfc_metadata(self.rfc_number, retries=2)
+
+        self.assertEqual(fetch.call_count, 3)
@@ -0,0 +1,44 @@
+from django.test import TestCase
+from directory.models import *
+from directory.signals import clear_technology_cache, get_technology
+
+
+class TechnologyCacheUnitTests(TestCase):
+    def tearDown(self):
+        # cached instances must not outlive the rolled back test transaction
+        clear_technology_cache(sender=None)
+
+    def test_cache_hit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            tech = get_technology(HashAlgorithm, 'SHA')
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_technology(HashAlgorithm, 'SHA'), tech)
+
+    def test_uncommitted_instances_not_cached(self):
+        get_technology(HashAlgorithm, 'SHA')
+
+        with self.assertNumQueries(1):
+            get_technology(HashAlgorithm, 'SHA')
+
+    def test_flag_refresh(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            get_technology(KexAlgorithm, 'DHE', pfs_support=True)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            tech = get_technology(KexAlgorithm, 'DHE', pfs_support=False)
+        self.assertFalse(tech.pfs_support)
+        self.assertFalse(KexAlgorithm.objects.get(pk='DHE').pfs_support)
+
+        with self.assertNumQueries(0):
+            tech = get_technology(KexAlgorithm, 'DHE', pfs_support=False)
+        self.assertFalse(tech.pfs_support)
+
+    def test_aead_refresh(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            get_technology(EncAlgorithm, 'AES 128 GCM', aead_algorithm=False)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            tech = get_technology(EncAlgorithm, 'AES 128 GCM', aead_algorithm=True)
+        self.assertTrue(tech.aead_algorithm)
+        self.assertTrue(EncAlgorithm.objects.get(pk='AES 128 GCM').aead_algorithm)
@@ -0,0 +1,69 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from directory.helpers import paginate
+from directory.models import *
+
+
+def create_rfcs(numbers):
+    Rfc.objects.bulk_create([
+        Rfc(number=n, title=f"RFC {n}", status='PST', release_year=2008)
+        for n in numbers
+    ])
+
+
+class PaginateUnitTests(TestCase):
+    def test_single_page(self):
+        create_rfcs(range(1, 21))
+
+        # one COUNT, the rows are only loaded once the page is listed
+        with self.assertNumQueries(2):
+            page = paginate(Rfc.objects.all(), '1', 15, single_page=True)
+            self.assertEqual(len(page.object_list), 20)
+            self.assertEqual(page.paginator.num_pages, 1)
+
+    def test_multiple_pages(self):
+        create_rfcs(range(1, 21))
+
+        with self.assertNumQueries(2):
+            page = paginate(Rfc.objects.all(), '2', 15)
+            self.assertEqual(len(page.object_list), 5)
+            self.assertEqual(page.paginator.num_pages, 2)
+
+    def test_single_page_empty(self):
+        with self.assertNumQueries(1):
+            page = paginate(Rfc.objects.all(), '1', 15, single_page=True)
+            self.assertEqual(len(page.object_list), 0)
+            self.assertEqual(page.paginator.count, 0)
+
+
+# keeps queries of the database cache out of the counts and renders
+# templates without collected static files
+@override_settings(
+    CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+    },
+    STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage',
+)
+class IndexSinglePageUnitTests(TestCase):
+    def setUp(self):
+        create_rfcs(range(1, 21))
+        for i in range(20):
+            CipherSuite.objects.create(
+                name=f"TLS_RSA_WITH_AES_{i}_CBC_SHA",
+                hex_byte_1='0x00',
+                hex_byte_2=f"0x{i:02X}",
+            )
+        # rendered pages are cached, so measure the uncached request
+        cache.clear()
+
+    def test_index_cs(self):
+        # one COUNT, one SELECT of the rows, the sponsor and the static
+        # pages of the navbar
+        with self.assertNumQueries(4):
+            response = self.client.get('/cs/', {'singlepage': 'true'})
+        self.assertEqual(len(response.context['results']), 20)
+
+    def test_index_rfc(self):
+        with self.assertNumQueries(4):
+            response = self.client.get('/rfc/', {'singlepage': 'true'})
+        self.assertEqual(len(response.context['results']), 20)
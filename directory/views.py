@@ -1,10 +1,23 @@
+from django.core.cache import cache
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404, render
-from directory.helpers import *
-from directory.models import *
-from directory.forms import *
+from django.views.decorators.cache import cache_control, cache_page
+from directory.helpers import (
+    filter_ciphersuites,
+    paginate,
+    search_cipher_suites,
+    search_rfcs,
+    sort_ciphersuites,
+    sort_rfcs,
+)
+from directory.models import Announcement, CipherSuite, Rfc, Sponsor, StaticPage
+from directory.forms import MainSearchForm
 import re
 
 
+# pages are cleared on changes, so only cache them server-side
+@cache_control(max_age=0)
+@cache_page(60 * 60)
 def index(request):
     """Site-wide index accessed when visiting the web root."""
 
@@ -20,6 +33,8 @@ def index(request):
     return render(request, 'directory/index.html', context)
 
 
+@cache_control(max_age=0)
+@cache_page(60 * 60)
 def static_page(request, sp_name):
     """Generic static page, to be created in admin interface."""
 
@@ -29,7 +44,6 @@ def static_page(request, sp_name):
 
     context = {
         'navbar_context': page.title,
-        'search_form': NavbarSearchForm(),
         'static_page': page,
         'sponsor': sponsor,
     }
@@ -37,6 +51,8 @@ def static_page(request, sp_name):
     return render(request, 'directory/static_page.html', context)
 
 
+@cache_control(max_age=0)
+@cache_page(60 * 60)
 def index_cs(request):
     """CipherSuite overview, listing all instances stored in the database."""
 
@@ -48,7 +64,8 @@ def index_cs(request):
     single_page = request.GET.get('singlepage', 'false')
     page = request.GET.get('page', '1')
 
-    ciphersuites = CipherSuite.objects.all()
+    # only load the columns rendered in the list
+    ciphersuites = CipherSuite.objects.only('name', 'security')
 
     # Filtering
     ciphersuites = filter_ciphersuites(
@@ -57,16 +74,10 @@ def index_cs(request):
     # Sorting
     ciphersuites = sort_ciphersuites(ciphersuites, sorting)
 
-    if len(ciphersuites) > 0:
-        ciphersuites = sort_ciphersuites(ciphersuites, sorting)
-
-    # paginate depending on GET parameter
-    if single_page == 'true' and len(ciphersuites) > 0:
-        ciphersuites_paginated = paginate(
-            ciphersuites, page, len(ciphersuites))
-    else:
-        ciphersuites_paginated = paginate(
-            ciphersuites, page, 15)
+    # paginate depending on GET parameter, counting rows in the database
+    # instead of loading all of them
+    ciphersuites_paginated = paginate(
+        ciphersuites, page, 15, single_page == 'true')
 
     sponsor = Sponsor.objects.first()
 
@@ -75,7 +86,6 @@ def index_cs(request):
         'navbar_context': 'cs',
         'page_number_range': ciphersuites_paginated.paginator.page_range,
         'results': ciphersuites_paginated,
-        'search_form': NavbarSearchForm(),
         'sec_level': sec_level,
         'singlepage': single_page,
         'software': software,
@@ -87,6 +97,8 @@ def index_cs(request):
     return render(request, 'directory/index_cs.html', context)
 
 
+@cache_control(max_age=0)
+@cache_page(60 * 60)
 def index_rfc(request):
     """Rfc overview, listing all instances stored in the database."""
 
@@ -96,13 +108,13 @@ def index_rfc(request):
     page = request.GET.get('page', '1').strip()
 
     # sort result list
-    rfc_list = sort_rfcs(Rfc.objects.all(), sorting)
+    rfc_list = sort_rfcs(
+        Rfc.objects.only('number', 'title', 'is_draft'), sorting
+    )
 
-    # paginate result list depending on GET parameter
-    if single_page == 'true':
-        rfc_list_paginated = paginate(rfc_list, page, len(rfc_list))
-    else:
-        rfc_list_paginated = paginate(rfc_list, page, 15)
+    # paginate result list depending on GET parameter, counting rows in
+    # the database instead of loading all of them
+    rfc_list_paginated = paginate(rfc_list, page, 15, single_page == 'true')
 
     sponsor = Sponsor.objects.first()
 
@@ -110,7 +122,6 @@ def index_rfc(request):
         'navbar_context': 'rfc',
         'page_number_range': rfc_list_paginated.paginator.page_range,
         'results': rfc_list_paginated,
-        'search_form': NavbarSearchForm(),
         'singlepage': single_page,
         'sponsor': sponsor,
         'sorting': sorting,
@@ -122,16 +133,40 @@ def index_rfc(request):
 def detail_cs(request, cs_name):
     """Detailed view of a CipherSuite instance."""
 
-    # query result
-    cipher_suite = get_object_or_404(CipherSuite, pk=cs_name)
-    referring_rfc_list = cipher_suite.defining_rfcs.all()
-    related_tech = [
-        cipher_suite.protocol_version,
-        cipher_suite.kex_algorithm,
-        cipher_suite.auth_algorithm,
-        cipher_suite.enc_algorithm,
-        cipher_suite.hash_algorithm,
-    ]
+    # query result, cached together with everything rendered for it
+    key = f"cs:{cs_name}"
+    data = cache.get(key)
+    if data is None:
+        cipher_suite = get_object_or_404(
+            CipherSuite.objects.select_related(
+                'protocol_version',
+                'kex_algorithm',
+                'auth_algorithm',
+                'enc_algorithm',
+                'hash_algorithm',
+            ).prefetch_related(
+                'defining_rfcs',
+                'tls_version',
+                'protocol_version__vulnerabilities',
+                'kex_algorithm__vulnerabilities',
+                'auth_algorithm__vulnerabilities',
+                'enc_algorithm__vulnerabilities',
+                'hash_algorithm__vulnerabilities',
+            ),
+            pk=cs_name
+        )
+        referring_rfc_list = list(cipher_suite.defining_rfcs.all())
+        related_tech = (
+            cipher_suite.protocol_version,
+            cipher_suite.kex_algorithm,
+            cipher_suite.auth_algorithm,
+            cipher_suite.enc_algorithm,
+            cipher_suite.hash_algorithm,
+        )
+        data = (cipher_suite, referring_rfc_list, related_tech)
+        cache.set(key, data, 60 * 60)
+
+    cipher_suite, referring_rfc_list, related_tech = data
 
     sponsor = Sponsor.objects.first()
 
@@ -139,7 +174,6 @@ def detail_cs(request, cs_name):
         'cipher_suite': cipher_suite,
         'referring_rfc_list': referring_rfc_list,
         'related_tech': related_tech,
-        'search_form': NavbarSearchForm(),
         'sponsor': sponsor,
     }
 
@@ -149,19 +183,21 @@ def detail_cs(request, cs_name):
 def detail_rfc(request, rfc_number):
     """Detailed view of an Rfc instance."""
 
-    # query result
-    rfc = get_object_or_404(Rfc, pk=rfc_number)
-    all_rfc_status_codes = {
-        'BCP': 'Best Current Practise',
-        'DST': 'Draft Standard',
-        'EXP': 'Experimental',
-        'HST': 'Historic',
-        'INF': 'Informational',
-        'IST': 'Internet Standard',
-        'PST': 'Proposed Standard',
-        'UND': 'Undefined',
-    }
-    rfc_status_code = all_rfc_status_codes[rfc.status]
+    # query result, including the related lists rendered on the page
+    rfc = get_object_or_404(
+        Rfc.objects.prefetch_related(
+            Prefetch(
+                'defined_cipher_suites',
+                queryset=CipherSuite.objects.only('name')
+            ),
+            Prefetch(
+                'related_documents',
+                queryset=Rfc.objects.only('number', 'is_draft')
+            ),
+        ),
+        pk=rfc_number
+    )
+    rfc_status_code = rfc.get_status_display()
     defined_cipher_suites = rfc.defined_cipher_suites.all()
     related_docs = rfc.related_documents.all()
     sponsor = Sponsor.objects.first()
@@ -171,7 +207,6 @@ def detail_rfc(request, rfc_number):
         'related_docs': related_docs,
         'rfc_status_code': rfc_status_code,
         'rfc': rfc,
-        'search_form': NavbarSearchForm(),
         'sponsor': sponsor,
     }
 
@@ -212,10 +247,8 @@ def search(request):
         result_list = result_list_rfc
 
     # paginate depending on GET parameter
-    if single_page == 'true' and len(result_list) > 0:
-        result_list_paginated = paginate(result_list, page, len(result_list))
-    else:
-        result_list_paginated = paginate(result_list, page, 15)
+    result_list_paginated = paginate(
+        result_list, page, 15, single_page == 'true')
 
     sponsor = Sponsor.objects.first()
 
@@ -226,7 +259,6 @@ def search(request):
         'result_count_cs': result_list_cs.count,
         'result_count_rfc': result_list_rfc.count,
         'results': result_list_paginated,
-        'search_form': NavbarSearchForm(),
         'search_term': search_term,
         'sec_level': sec_level,
         'singlepage': single_page,